@@ -0,0 +1,53 @@
+"""
+Benchmark de escalabilidade do backtest paralelo.
+
+Gera arquivos de comandos sintéticos e executa o backtest com 1, 2, 4, ...
+processos até o número de CPUs, exibindo a vazão e o speedup em relação a
+um único processo.
+
+Uso:
+    python benchmarks/bench_backtest.py [--files N] [--orders N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from main import generate_flow
+from matching_engine.backtest import run_backtest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest scaling benchmark')
+    parser.add_argument('--files', type=int, default=64, help='Arquivos de comandos gerados')
+    parser.add_argument('--orders', type=int, default=20000, help='Comandos por arquivo')
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= cpu_count:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != cpu_count:
+        worker_counts.append(cpu_count)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp_dir, f'flow_{i:05d}.txt')
+            with open(path, 'w') as command_file:
+                command_file.write('\n'.join(generate_flow(args.orders, seed=i)))
+            paths.append(path)
+
+        baseline = None
+        for workers in worker_counts:
+            totals = run_backtest(paths, os.path.join(tmp_dir, f'out_{workers}'), workers=workers)
+            baseline = baseline or totals['elapsed_s']
+            print(f"workers {workers:3d} | {totals['elapsed_s']:8.3f} s | "
+                  f"{totals['commands_per_s']:10.0f} commands/s | speedup {baseline / totals['elapsed_s']:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
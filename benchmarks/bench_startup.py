@@ -0,0 +1,100 @@
+"""
+Benchmark de startup: tempo até a primeira ordem aceita.
+
+Inicia processos `main.py replay -` novos e mede o tempo desde o spawn até o
+engine confirmar a primeira ordem limit na saída padrão. Também mede o mesmo
+caminho com warm start a partir de um snapshot e, como referência, o tempo de
+um interpretador Python vazio.
+
+Uso:
+    python benchmarks/bench_startup.py [--runs N] [--snapshot-orders N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, 'main.py')
+FIRST_ORDER = b'limit buy 1.0 1.0\n'
+
+
+def time_to_first_order(extra_args):
+    """
+    Mede o tempo até a primeira ordem aceita em um processo novo.
+
+    Args:
+        extra_args (list): Argumentos adicionais para o subcomando replay
+
+    Returns:
+        float: Tempo em segundos entre o spawn e a confirmação da ordem
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, MAIN, 'replay', '-'] + extra_args,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        cwd=ROOT,
+        env=dict(os.environ, PYTHONUNBUFFERED='1'),
+    )
+    process.stdin.write(FIRST_ORDER)
+    process.stdin.flush()
+
+    for line in process.stdout:
+        if b'placed' in line:
+            elapsed = time.perf_counter() - start
+            break
+    else:
+        raise RuntimeError('Engine exited before accepting the first order')
+
+    process.stdin.close()
+    process.wait()
+    return elapsed
+
+
+def time_empty_interpreter():
+    """
+    Mede o tempo de um interpretador Python que não faz nada.
+
+    Returns:
+        float: Tempo em segundos do spawn até o fim do processo
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'pass'], check=True)
+    return time.perf_counter() - start
+
+
+def report(name, samples):
+    """
+    Exibe mínimo, mediana e máximo de uma série de medições em milissegundos.
+    """
+    print(f"{name:<28} min {min(samples) * 1000:8.2f} ms | "
+          f"median {statistics.median(samples) * 1000:8.2f} ms | "
+          f"max {max(samples) * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup benchmark (time to first order accepted)')
+    parser.add_argument('--runs', type=int, default=20, help='Processos por cenário')
+    parser.add_argument('--snapshot-orders', type=int, default=10000, help='Comandos usados para gerar o snapshot')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot_path = os.path.join(tmp_dir, 'snapshot.json')
+        subprocess.run(
+            [sys.executable, MAIN, 'bench', '--orders', str(args.snapshot_orders), '--save-snapshot', snapshot_path],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            cwd=ROOT,
+        )
+
+        report('python -c pass', [time_empty_interpreter() for _ in range(args.runs)])
+        report('replay (cold)', [time_to_first_order([]) for _ in range(args.runs)])
+        report('replay (warm snapshot)', [time_to_first_order(['--snapshot', snapshot_path]) for _ in range(args.runs)])
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,6 @@
-from matching_engine.order_book import OrderBook
+import contextlib
+import os
+import sys
 
 def print_banner():
     """
@@ -17,9 +19,17 @@ def print_help():
     print("  limit <buy|sell> <price> <qty>   - Colocar uma Limit Order")
     print("  market <buy|sell> <qty>          - Colocar uma Market Order")
     print("  peg <buy|sell> <qty>             - Colocar uma Pegged Order")
+    print("  iceberg <buy|sell> <price> <qty> <display_qty>")
+    print("                                   - Colocar uma Iceberg Order")
+    print("  stop <buy|sell> <stop_price> <qty>")
+    print("                                   - Colocar uma Stop Order")
+    print("  stop_limit <buy|sell> <stop_price> <limit_price> <qty>")
+    print("                                   - Colocar uma Stop Limit Order")
     print("  cancel <order_id>                - Cancelar uma order")
     print("  edit <order_id> <price> <qty>    - Editar uma limit order")
     print("  edit <order_id> <qty>            - Editar uma pegged order")
+    print("  edit <order_id> <price> <qty>    - Editar uma iceberg order (qty total)")
+    print("  edit <order_id> <stop_price> <qty> - Editar uma stop order")
     print("  print                            - Exibir Order Book")
     print("  help                             - Mostrar comandos")
     print("  exit                             - Sair")
@@ -34,43 +44,317 @@ def print_prompt():
     """
     return input("\n Insira o comando (escreva 'help' para comandos): ").strip()
 
-def main():
+def load_order_book(snapshot_path=None):
     """
-    Função principal que executa o loop de interação com o usuário.
+    Cria o order book usado por um subcomando.
     
-    Cria um order book e processa comandos até que o usuário digite 'exit'.
-    Trata erros e exibe mensagens apropriadas.
+    Args:
+        snapshot_path (str): Caminho de um snapshot para warm start (opcional)
+        
+    Returns:
+        OrderBook: Order book vazio ou restaurado a partir do snapshot
+        
+    Os imports do engine são feitos aqui, e não no topo do módulo, para que
+    cada subcomando carregue apenas o que precisa.
+    """
+    if snapshot_path:
+        from matching_engine.snapshot import load_snapshot
+        return load_snapshot(snapshot_path)
+
+    from matching_engine.order_book import OrderBook
+    return OrderBook()
+
+def save_order_book(order_book, snapshot_path):
+    """
+    Salva o order book em um snapshot, se um caminho for informado.
+    
+    Args:
+        order_book (OrderBook): Order book a ser salvo
+        snapshot_path (str): Caminho do snapshot (None para não salvar)
+    """
+    if snapshot_path:
+        from matching_engine.snapshot import save_snapshot
+        save_snapshot(order_book, snapshot_path)
+
+def run_command(order_book, command):
+    """
+    Executa um comando no order book tratando erros de entrada.
+    
+    Args:
+        order_book (OrderBook): Order book que recebe o comando
+        command (str): Comando a ser executado
+    """
+    try:
+        order_book.parse_command(command)
+    except ValueError as e:
+        print(f"\nError: {e}")
+        print("Escreva 'help' para ver comandos.")
+    except IndexError:
+        print("\nError: Formato de comando inválido. Parâmetros ausentes.")
+        print("Escreva 'help' para ver comandos.")
+    except Exception as e:
+        print(f"\nUnexpected error: {e}")
+        print("Escreva 'help' para ver comandos.")
+
+def replay_commands(order_book, lines):
     """
-    order_book = OrderBook()
+    Executa uma sequência de comandos no order book.
+    
+    Args:
+        order_book (OrderBook): Order book que recebe os comandos
+        lines (iterable): Linhas de comando (linhas vazias e iniciadas por '#' são ignoradas)
+        
+    Returns:
+        int: Quantidade de comandos executados
+        
+    A execução é interrompida ao encontrar o comando 'exit'.
+    """
+    executed = 0
+
+    for line in lines:
+        command = line.strip()
+
+        if not command or command.startswith('#'):
+            continue
+
+        if command.lower() == 'exit':
+            break
+
+        run_command(order_book, command)
+        executed += 1
+
+    return executed
+
+def generate_flow(n_commands, seed):
+    """
+    Gera um fluxo sintético e determinístico de comandos para benchmark.
+    
+    Args:
+        n_commands (int): Quantidade de comandos a gerar
+        seed (int): Semente do gerador aleatório
+        
+    Returns:
+        list: Comandos no formato aceito por parse_command
+    """
+    import random
+
+    rng = random.Random(seed)
+    commands = []
+
+    for i in range(n_commands):
+        roll = rng.random()
+        side = rng.choice(['buy', 'sell'])
+
+        if roll < 0.7:
+            commands.append(f'limit {side} {rng.randint(95, 105)}.0 {rng.randint(1, 20)}.0')
+        elif roll < 0.85:
+            commands.append(f'market {side} {rng.randint(1, 20)}.0')
+        else:
+            commands.append(f'cancel {rng.randint(0, i)}')
+
+    return commands
+
+def run_interactive(args):
+    """
+    Executa o loop de interação com o usuário.
+    
+    Cria (ou restaura) um order book e processa comandos até que o usuário
+    digite 'exit'.
+    """
+    order_book = load_order_book(args.snapshot)
     
     print_banner()
     
     while True:
         try:
             command = print_prompt()
+        except EOFError:
+            command = 'exit'
             
-            if not command:
-                continue
-            
-            if command.lower() == 'exit':
-                print("\nSaindo")
-                break
-            
-            if command.lower() == 'help':
-                print_help()
-                continue
-            
+        if not command:
+            continue
+        
+        if command.lower() == 'exit':
+            print("\nSaindo")
+            break
+        
+        if command.lower() == 'help':
+            print_help()
+            continue
+        
+        run_command(order_book, command)
+
+    save_order_book(order_book, args.save_snapshot)
+
+def run_replay(args):
+    """
+    Reexecuta um arquivo de comandos (ou a entrada padrão com '-').
+    
+    Com --quiet a saída do engine é descartada, o que é útil para replays
+    longos e backtests. Com --profile o replay roda no modo de diagnóstico
+    (tempo e alocações por estágio) e o relatório é exibido ao final.
+    """
+    order_book = load_order_book(args.snapshot)
+    profiler = None
+
+    if args.profile:
+        from matching_engine.profiler import StageProfiler
+        profiler = StageProfiler()
+        profiler.attach(order_book)
+
+    if args.file == '-':
+        command_file = contextlib.nullcontext(sys.stdin)
+    else:
+        command_file = open(args.file)
+
+    with command_file as lines, contextlib.ExitStack() as stack:
+        output = sys.stdout
+        if args.quiet:
+            output = stack.enter_context(open(os.devnull, 'w'))
+        if profiler:
+            output = profiler.wrap_output(output)
+            profiler.start()
+            stack.callback(profiler.stop)
+        if output is not sys.stdout:
+            stack.enter_context(contextlib.redirect_stdout(output))
+        replay_commands(order_book, lines)
+
+    if profiler:
+        print(profiler.report())
+
+    save_order_book(order_book, args.save_snapshot)
+
+def run_bench(args):
+    """
+    Mede a vazão do engine processando um fluxo sintético de comandos.
+    """
+    import time
+
+    order_book = load_order_book(args.snapshot)
+    commands = generate_flow(args.orders, args.seed)
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for command in commands:
             order_book.parse_command(command)
-            
-        except ValueError as e:
-            print(f"\nError: {e}")
-            print("Escreva 'help' para ver comandos.")
-        except IndexError:
-            print("\nError: Formato de comando inválido. Parâmetros ausentes.")
-            print("Escreva 'help' para ver comandos.")
-        except Exception as e:
-            print(f"\nUnexpected error: {e}")
-            print("Escreva 'help' para ver comandos.")
+        elapsed = time.perf_counter() - start
+
+    print(f"{len(commands)} commands in {elapsed:.3f}s ({len(commands) / elapsed:.0f} commands/s)")
+
+    save_order_book(order_book, args.save_snapshot)
+
+def run_serve(args):
+    """
+    Serve o order book via TCP, um comando por linha.
+    
+    A saída de cada comando é devolvida ao cliente. As conexões são atendidas
+    uma de cada vez, todas sobre o mesmo order book.
+    """
+    import io
+    import socketserver
+
+    order_book = load_order_book(args.snapshot)
+
+    class CommandHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw_line in self.rfile:
+                command = raw_line.decode().strip()
+
+                if not command:
+                    continue
+
+                if command.lower() == 'exit':
+                    break
+
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    run_command(order_book, command)
+                self.wfile.write(output.getvalue().encode())
+
+    with socketserver.TCPServer((args.host, args.port), CommandHandler) as server:
+        print(f"Serving on {args.host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nSaindo")
+
+    save_order_book(order_book, args.save_snapshot)
+
+def run_backtest(args):
+    """
+    Reexecuta muitos arquivos de comandos em paralelo, um order book por arquivo.
+    
+    Diretórios informados são expandidos para os arquivos que contêm.
+    """
+    from matching_engine.backtest import run_backtest as backtest
+
+    paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            paths.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if os.path.isfile(os.path.join(path, name)))
+        else:
+            paths.append(path)
+
+    totals = backtest(paths, args.output, args.workers, args.chunksize)
+
+    print(f"{totals['files']} files, {totals['commands']} commands, {totals['trades']} trades "
+          f"in {totals['elapsed_s']:.3f}s ({totals['commands_per_s']:.0f} commands/s)")
+    print(f"Results written to {args.output}")
+
+def build_parser():
+    """
+    Monta o parser de argumentos da linha de comando.
+    
+    Returns:
+        argparse.ArgumentParser: Parser com os subcomandos interactive, replay, bench, serve e backtest
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='PS MS - Matching Engine')
+    parser.set_defaults(handler=run_interactive, snapshot=None, save_snapshot=None)
+    subparsers = parser.add_subparsers(dest='command')
+
+    interactive = subparsers.add_parser('interactive', help='Loop interativo (padrão)')
+    interactive.set_defaults(handler=run_interactive)
+
+    replay = subparsers.add_parser('replay', help='Reexecuta um arquivo de comandos')
+    replay.add_argument('file', help="Arquivo de comandos ('-' para a entrada padrão)")
+    replay.add_argument('--quiet', action='store_true', help='Descarta a saída do engine')
+    replay.add_argument('--profile', action='store_true', help='Mede tempo e alocações por estágio e exibe um relatório')
+    replay.set_defaults(handler=run_replay)
+
+    bench = subparsers.add_parser('bench', help='Mede a vazão do engine')
+    bench.add_argument('--orders', type=int, default=100000, help='Quantidade de comandos')
+    bench.add_argument('--seed', type=int, default=0, help='Semente do fluxo sintético')
+    bench.set_defaults(handler=run_bench)
+
+    serve = subparsers.add_parser('serve', help='Serve o order book via TCP')
+    serve.add_argument('--host', default='127.0.0.1', help='Endereço de escuta')
+    serve.add_argument('--port', type=int, default=8000, help='Porta de escuta')
+    serve.set_defaults(handler=run_serve)
+
+    backtest = subparsers.add_parser('backtest', help='Reexecuta muitos arquivos de comandos em paralelo')
+    backtest.add_argument('paths', nargs='+', help='Arquivos de comandos ou diretórios')
+    backtest.add_argument('--output', default='backtest_output', help='Diretório de saída (trades.csv e stats.csv)')
+    backtest.add_argument('--workers', type=int, help='Quantidade de processos (padrão: número de CPUs)')
+    backtest.add_argument('--chunksize', type=int, help='Arquivos enviados por vez a cada processo')
+    backtest.set_defaults(handler=run_backtest)
+
+    for subparser in (interactive, replay, bench, serve):
+        subparser.add_argument('--snapshot', help='Snapshot para warm start')
+        subparser.add_argument('--save-snapshot', help='Salva o order book neste snapshot ao terminar')
+
+    return parser
+
+def main(argv=None):
+    """
+    Ponto de entrada da linha de comando.
+    
+    Sem subcomando, executa o loop interativo.
+    """
+    args = build_parser().parse_args(argv)
+    args.handler(args)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,113 @@
+import csv
+import contextlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from matching_engine.order_book import OrderBook
+
+TRADE_COLUMNS = ['file', 'aggressor_id', 'side', 'price', 'qty']
+STATS_COLUMNS = [
+    'file', 'commands', 'errors', 'trades', 'elapsed_s', 'commands_per_s',
+    'resting_orders', 'best_bid', 'best_ask', 'bid_qty', 'ask_qty',
+]
+
+
+def run_file(path: str):
+    """
+    Reexecuta um arquivo de comandos em um order book independente, sem saída.
+
+    Args:
+        path (str): Arquivo de comandos, um por linha (linhas vazias e
+                    iniciadas por '#' são ignoradas, 'exit' encerra)
+
+    Returns:
+        dict: Trade tape, estatísticas finais do book e vazão do arquivo
+
+    Comandos inválidos não interrompem o replay; eles são contados em 'errors'.
+    """
+    order_book = OrderBook()
+    order_book.trade_tape = []
+    commands = 0
+    errors = 0
+
+    with open(path) as command_file:
+        lines = command_file.readlines()
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for line in lines:
+            command = line.strip()
+
+            if not command or command.startswith('#'):
+                continue
+
+            if command.lower() == 'exit':
+                break
+
+            commands += 1
+            try:
+                order_book.parse_command(command)
+            except Exception:
+                errors += 1
+        elapsed = time.perf_counter() - start
+
+    return {
+        'file': path,
+        'commands': commands,
+        'errors': errors,
+        'trades': order_book.trade_tape,
+        'elapsed_s': elapsed,
+        'commands_per_s': commands / elapsed if elapsed > 0 else 0.0,
+        'resting_orders': len(order_book.orders_by_id),
+        'best_bid': order_book.bids.peekitem(0)[0] if order_book.bids else '',
+        'best_ask': order_book.asks.peekitem(0)[0] if order_book.asks else '',
+        'bid_qty': sum(sum(order_book.level_qty('buy', price)) for price in order_book.bids),
+        'ask_qty': sum(sum(order_book.level_qty('sell', price)) for price in order_book.asks),
+    }
+
+
+def run_backtest(paths: list, output_dir: str, workers: int = None, chunksize: int = None):
+    """
+    Reexecuta vários arquivos de comandos em paralelo e consolida os resultados.
+
+    Args:
+        paths (list): Arquivos de comandos, cada um executado em um order book próprio
+        output_dir (str): Diretório onde trades.csv e stats.csv são gravados
+        workers (int): Quantidade de processos (padrão: número de CPUs)
+        chunksize (int): Arquivos enviados por vez a cada processo
+                         (padrão: ~4 lotes por processo)
+
+    Returns:
+        dict: Totais do backtest (files, commands, trades, elapsed_s, commands_per_s)
+
+    Os resultados são gravados na ordem dos arquivos de entrada, à medida que
+    ficam prontos, então a saída é determinística independente de workers.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, len(paths) // (workers * 4))
+    os.makedirs(output_dir, exist_ok=True)
+
+    totals = {'files': 0, 'commands': 0, 'trades': 0}
+    start = time.perf_counter()
+
+    with open(os.path.join(output_dir, 'trades.csv'), 'w', newline='') as trades_file, \
+            open(os.path.join(output_dir, 'stats.csv'), 'w', newline='') as stats_file, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        trades_writer = csv.writer(trades_file)
+        trades_writer.writerow(TRADE_COLUMNS)
+        stats_writer = csv.DictWriter(stats_file, fieldnames=STATS_COLUMNS, extrasaction='ignore')
+        stats_writer.writeheader()
+
+        for result in executor.map(run_file, paths, chunksize=chunksize):
+            trades_writer.writerows((result['file'],) + trade for trade in result['trades'])
+            stats_writer.writerow(dict(result, trades=len(result['trades'])))
+
+            totals['files'] += 1
+            totals['commands'] += result['commands']
+            totals['trades'] += len(result['trades'])
+
+    totals['elapsed_s'] = time.perf_counter() - start
+    totals['commands_per_s'] = totals['commands'] / totals['elapsed_s'] if totals['elapsed_s'] > 0 else 0.0
+
+    return totals
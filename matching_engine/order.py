@@ -4,25 +4,34 @@ class Order:
     
     Attributes:
         id_order (int): Identificador único da ordem
-        type (str): Tipo da ordem ('limit', 'market', 'peg')
+        type (str): Tipo da ordem ('limit', 'market', 'peg', 'iceberg', 'stop', 'stop_limit')
         side (str): Lado da ordem ('buy' ou 'sell')
-        price (float): Preço da ordem (-1 para market orders)
-        qty (float): Quantidade da ordem
+        price (float): Preço da ordem (-1 para market e stop orders)
+        qty (float): Quantidade da ordem (quantidade exibida para iceberg orders)
+        display_qty (float): Tamanho da fatia exibida (apenas iceberg orders)
+        hidden_qty (float): Quantidade oculta em reserva (apenas iceberg orders)
+        stop_price (float): Preço de disparo (apenas stop e stop_limit orders)
     """
     
-    def __init__(self, id_order, type, side, price, qty):
+    def __init__(self, id_order, type, side, price, qty, display_qty=None, hidden_qty=0, stop_price=None):
         """
         Inicializa uma nova ordem.
         
         Args:
             id_order (int): Identificador único da ordem
-            type (str): Tipo da ordem ('limit', 'market', 'peg')
+            type (str): Tipo da ordem ('limit', 'market', 'peg', 'iceberg', 'stop', 'stop_limit')
             side (str): Lado da ordem ('buy' ou 'sell')
-            price (float): Preço da ordem (-1 para market orders)
+            price (float): Preço da ordem (-1 para market e stop orders)
             qty (float): Quantidade da ordem
+            display_qty (float): Tamanho da fatia exibida (None se não for iceberg)
+            hidden_qty (float): Quantidade oculta em reserva (0 se não for iceberg)
+            stop_price (float): Preço de disparo (None se não for stop ou stop_limit)
         """
         self.id_order = id_order
         self.type = type
         self.side = side
         self.price = price
-        self.qty = qty
\ No newline at end of file
+        self.qty = qty
+        self.display_qty = display_qty
+        self.hidden_qty = hidden_qty
+        self.stop_price = stop_price
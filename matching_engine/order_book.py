@@ -7,12 +7,19 @@ class OrderBook:
     
     O OrderBook mantém dois dicionários ordenados: bids (ordens de compra) e asks (ordens de venda).
     Implementa lógica de matching para executar trades quando ordens compatíveis são encontradas.
+    Stop orders ficam fora do book visível, em índices de disparo ordenados por preço de disparo.
     
     Attributes:
         bids (SortedDict): Dicionário ordenado de ordens de compra (preço decrescente)
         asks (SortedDict): Dicionário ordenado de ordens de venda (preço crescente)
         orders_by_id (dict): Mapeamento de ID para ordem para acesso rápido
         next_id (int): Próximo ID disponível para uma nova ordem
+        trade_tape (list): Registro opcional de trades (aggressor_id, side, price, qty);
+                           None desativa o registro
+        buy_stops (SortedDict): Stop orders de compra por preço de disparo (crescente)
+        sell_stops (SortedDict): Stop orders de venda por preço de disparo (decrescente)
+        last_price (float): Preço do último trade (None se ainda não houve trades)
+        releasing_stops (bool): Indica que stop orders disparadas estão sendo liberadas
     """
     
     def __init__(self):
@@ -21,11 +28,17 @@ class OrderBook:
         
         Bids são ordenadas por preço decrescente (maior preço primeiro).
         Asks são ordenadas por preço crescente (menor preço primeiro).
+        Em buy_stops e sell_stops o primeiro nível é sempre o próximo a disparar.
         """
         self.bids = SortedDict(lambda x: -x)
         self.asks = SortedDict()
         self.orders_by_id = {}
         self.next_id = 0
+        self.trade_tape = None
+        self.buy_stops = SortedDict()
+        self.sell_stops = SortedDict(lambda x: -x)
+        self.last_price = None
+        self.releasing_stops = False
 
     def parse_command(self, command: str):
         """
@@ -42,6 +55,9 @@ class OrderBook:
             - limit <buy|sell> <price> <qty>: Cria uma ordem limit
             - market <buy|sell> <qty>: Cria uma ordem market
             - peg <buy|sell> <qty>: Cria uma ordem pegged
+            - iceberg <buy|sell> <price> <qty> <display_qty>: Cria uma ordem iceberg
+            - stop <buy|sell> <stop_price> <qty>: Cria uma ordem stop
+            - stop_limit <buy|sell> <stop_price> <limit_price> <qty>: Cria uma ordem stop limit
             - cancel <order_id>: Cancela uma ordem
             - edit <order_id> <price> <qty>: Edita uma ordem existente
         """
@@ -52,13 +68,19 @@ class OrderBook:
         
         if command_parts[0] == 'print':
             self.print_order_book()
-        elif command_parts[0] in ['limit', 'market', 'peg']:
+        elif command_parts[0] in ['limit', 'market', 'peg', 'iceberg', 'stop', 'stop_limit']:
             if command_parts[0] == 'limit' and len(command_parts) < 4:
                 raise ValueError(f'Limit order requires 3 parameters: <buy|sell> <price> <qty>')
             elif command_parts[0] == 'market' and len(command_parts) < 3:
                 raise ValueError(f'Market order requires 2 parameters: <buy|sell> <qty>')
             elif command_parts[0] == 'peg' and len(command_parts) < 3:
                 raise ValueError(f'Peg order requires 2 parameters: <buy|sell> <qty>')
+            elif command_parts[0] == 'iceberg' and len(command_parts) < 5:
+                raise ValueError(f'Iceberg order requires 4 parameters: <buy|sell> <price> <qty> <display_qty>')
+            elif command_parts[0] == 'stop' and len(command_parts) < 4:
+                raise ValueError(f'Stop order requires 3 parameters: <buy|sell> <stop_price> <qty>')
+            elif command_parts[0] == 'stop_limit' and len(command_parts) < 5:
+                raise ValueError(f'Stop limit order requires 4 parameters: <buy|sell> <stop_price> <limit_price> <qty>')
             
             if command_parts[1] not in ['buy', 'sell']:
                 raise ValueError(f'Side must be "buy" or "sell", got "{command_parts[1]}"')
@@ -99,11 +121,20 @@ class OrderBook:
             order_attr (list): Lista com atributos da ordem
                              [type, side, price, qty] para limit orders
                              [type, side, qty] para market/peg orders
+                             [type, side, price, qty, display_qty] para iceberg orders
+                             [type, side, stop_price, qty] para stop orders
+                             [type, side, stop_price, limit_price, qty] para stop_limit orders
                              
         Comportamento:
             - Market orders: Executadas imediatamente contra o melhor preço disponível
             - Limit orders: Matching primeiro, depois inserção no book se houver quantidade restante
             - Peg orders: Colocadas no melhor preço do lado correspondente
+            - Iceberg orders: Matching com a quantidade total, depois inserção no book
+              exibindo apenas uma fatia de display_qty e mantendo o restante oculto
+            - Stop/stop_limit orders: Guardadas no índice de disparo do seu lado até
+              que o último preço negociado alcance o preço de disparo
+            
+        Ao final, as stop orders disparadas pelos trades desta ordem são liberadas.
         """
 
         if order_attr[0] == 'market':
@@ -196,7 +227,80 @@ class OrderBook:
                     print(f'Pegged sell order {order.id_order} placed at price {best_price} for qty {qty}')
                 else:
                     print('No asks in the order book to peg against. Order not placed.')
-                
+
+        elif order_attr[0] == 'iceberg':
+            try:
+                price = float(order_attr[2])
+                qty = float(order_attr[3])
+                display_qty = float(order_attr[4])
+            except ValueError:
+                raise ValueError(f'Price, quantity and display quantity must be numbers')
+
+            if display_qty <= 0:
+                raise ValueError(f'Display quantity must be positive, got "{order_attr[4]}"')
+
+            if len(order_attr) == 6:
+                order_id = int(order_attr[5])
+            else:
+                order_id = self.next_id
+                self.next_id += 1
+
+            order = Order(order_id, order_attr[0], order_attr[1], price, qty, display_qty)
+            order = self.match_order(order)
+
+            if order.qty > 0:
+                order.hidden_qty = max(order.qty - display_qty, 0)
+                order.qty = min(order.qty, display_qty)
+
+                if order.side == 'buy':
+                    book_side = self.bids
+                else:
+                    book_side = self.asks
+
+                if order.price in book_side.keys():
+                    book_side[order.price].append(order)
+                else:
+                    book_side[order.price] = [order]
+                    if book_side.peekitem(0)[0] == order.price:
+                        self.uptade_pegged(order.side)
+
+                self.orders_by_id[order.id_order] = order
+                print(f'Iceberg {order.side} order {order.id_order} placed at price {price} for qty {order.qty} (hidden qty {order.hidden_qty})')
+            else:
+                print(f'Iceberg order {order.id_order} fully executed')
+
+        elif order_attr[0] in ['stop', 'stop_limit']:
+            try:
+                stop_price = float(order_attr[2])
+                if order_attr[0] == 'stop':
+                    price = -1
+                    qty = float(order_attr[3])
+                else:
+                    price = float(order_attr[3])
+                    qty = float(order_attr[4])
+            except ValueError:
+                raise ValueError(f'Stop price, limit price and quantity must be numbers')
+
+            n_params = 4 if order_attr[0] == 'stop' else 5
+            if len(order_attr) == n_params + 1:
+                order_id = int(order_attr[n_params])
+            else:
+                order_id = self.next_id
+                self.next_id += 1
+
+            order = Order(order_id, order_attr[0], order_attr[1], price, qty, stop_price=stop_price)
+            stops = self.buy_stops if order.side == 'buy' else self.sell_stops
+
+            if stop_price in stops.keys():
+                stops[stop_price].append(order)
+            else:
+                stops[stop_price] = [order]
+
+            self.orders_by_id[order.id_order] = order
+            print(f'Stop {order.side} order {order.id_order} placed with stop price {stop_price} for qty {qty}')
+
+        self.release_stops()
+
 
     
 
@@ -218,7 +322,11 @@ class OrderBook:
             - Sell orders fazem match com bids (ordens de compra)
             - Market orders executam ao melhor preço disponível
             - Limit orders executam apenas ao preço especificado ou melhor
-            - Trades são impressos conforme acontecem
+            - Iceberg orders passivas totalmente consumidas repõem a fatia exibida
+              a partir da reserva oculta e voltam ao fim da fila do mesmo nível
+            - Trades são impressos conforme acontecem e, se trade_tape não for None,
+              registrados nele
+            - O preço do último trade é guardado em last_price para o disparo de stop orders
         """
         trades = {}
 
@@ -240,12 +348,15 @@ class OrderBook:
                             trades[passive_order.price] += passive_order.qty
                         else:
                             trades[passive_order.price] = passive_order.qty
-                        del self.orders_by_id[passive_order.id_order]
                         self.asks.peekitem(0)[1].pop(0)
-                        if not self.asks.peekitem(0)[1]:
-                            self.asks.popitem(0)
+                        if self.replenish_iceberg(passive_order):
+                            self.asks.peekitem(0)[1].append(passive_order)
+                        else:
+                            del self.orders_by_id[passive_order.id_order]
+                            if not self.asks.peekitem(0)[1]:
+                                self.asks.popitem(0)
 
-            elif order.type == 'limit':
+            elif order.type in ['limit', 'iceberg']:
                 if order.price in self.asks.keys():
                     while order.qty and self.asks[order.price]:
                         passive_order = self.asks[order.price][0]
@@ -264,8 +375,11 @@ class OrderBook:
                                 trades[passive_order.price] += passive_order.qty
                             else:
                                 trades[passive_order.price] = passive_order.qty
-                            del self.orders_by_id[passive_order.id_order]
                             self.asks[order.price].pop(0)
+                            if self.replenish_iceberg(passive_order):
+                                self.asks[order.price].append(passive_order)
+                            else:
+                                del self.orders_by_id[passive_order.id_order]
                     
                     if not self.asks[order.price]:
                         self.asks.pop(order.price)
@@ -289,10 +403,13 @@ class OrderBook:
                             trades[passive_order.price] += passive_order.qty
                         else:
                             trades[passive_order.price] = passive_order.qty
-                        del self.orders_by_id[passive_order.id_order]
                         self.bids.peekitem(0)[1].pop(0)
-                        if not self.bids.peekitem(0)[1]:
-                            self.bids.popitem(0)
+                        if self.replenish_iceberg(passive_order):
+                            self.bids.peekitem(0)[1].append(passive_order)
+                        else:
+                            del self.orders_by_id[passive_order.id_order]
+                            if not self.bids.peekitem(0)[1]:
+                                self.bids.popitem(0)
 
             else:
                 if order.price in self.bids.keys():
@@ -304,8 +421,8 @@ class OrderBook:
                                 trades[passive_order.price] += order.qty
                             else:
                                 trades[passive_order.price] = order.qty
-                            order.qty = 0
                             passive_order.qty -= order.qty
+                            order.qty = 0
                         
                         else:
                             order.qty -= passive_order.qty
@@ -313,8 +430,11 @@ class OrderBook:
                                 trades[passive_order.price] += passive_order.qty
                             else:
                                 trades[passive_order.price] = passive_order.qty
-                            del self.orders_by_id[passive_order.id_order]
                             self.bids[order.price].pop(0)
+                            if self.replenish_iceberg(passive_order):
+                                self.bids[order.price].append(passive_order)
+                            else:
+                                del self.orders_by_id[passive_order.id_order]
                     
                     if not self.bids[order.price]:
                         self.bids.pop(order.price)
@@ -322,6 +442,9 @@ class OrderBook:
                 
         for trade in trades.items():
             print(f"Trade, price: {trade[0]}, qty: {trade[1]}")
+            if self.trade_tape is not None:
+                self.trade_tape.append((order.id_order, order.side, trade[0], trade[1]))
+            self.last_price = trade[0]
 
         return order
     
@@ -330,7 +453,9 @@ class OrderBook:
         Exibe o estado atual do order book de forma formatada.
         
         Mostra todas as ordens de compra (bids) e venda (asks) organizadas
-        por nível de preço, incluindo IDs, preços e quantidades.
+        por nível de preço, incluindo IDs, preços e quantidades. O total de cada
+        nível separa a quantidade exibida da quantidade oculta (iceberg orders).
+        Stop orders pendentes são listadas à parte, pois não estão no book visível.
         """
         print("\n" + "="*70)
         print(" "*25 + "ORDER BOOK")
@@ -342,13 +467,11 @@ class OrderBook:
             print("  No buy orders")
         else:
             for price in self.bids:
-                total_qty = 0
-
                 for order in self.bids[price]:
-                    total_qty += order.qty
                     print(f"  Order ID: {order.id_order:3d} | Price: {order.price:8.2f} | Qty: {order.qty:8.2f}")
 
-                print(f"  Price Level: {price:8.2f} | Total Qty: {total_qty:8.2f}")
+                total_qty, hidden_qty = self.level_qty('buy', price)
+                print(f"  Price Level: {price:8.2f} | Total Qty: {total_qty:8.2f} | Hidden Qty: {hidden_qty:8.2f}")
                 print("-" * 70)
 
         print("\nASKS (Sell Orders):")
@@ -357,18 +480,68 @@ class OrderBook:
             print("  No sell orders")
         else:
             for price in self.asks:
-                total_qty = 0
-                total_price = 0
-
                 for order in self.asks[price]:
-                    total_qty += order.qty
-                    total_price += order.price
                     print(f"  Order ID: {order.id_order:3d} | Price: {order.price:8.2f} | Qty: {order.qty:8.2f}")
 
-                print(f"  Price Level: {price:8.2f} | Total Qty: {total_qty:8.2f}")
+                total_qty, hidden_qty = self.level_qty('sell', price)
+                print(f"  Price Level: {price:8.2f} | Total Qty: {total_qty:8.2f} | Hidden Qty: {hidden_qty:8.2f}")
                 print("-" * 70)
+
+        if self.buy_stops or self.sell_stops:
+            print("\nSTOPS (Pending Stop Orders):")
+            print("-" * 70)
+            for stops in (self.buy_stops, self.sell_stops):
+                for stop_price in stops:
+                    for order in stops[stop_price]:
+                        limit = f"{order.price:8.2f}" if order.type == 'stop_limit' else "  market"
+                        print(f"  Order ID: {order.id_order:3d} | Side: {order.side:4s} | Stop: {stop_price:8.2f} | Limit: {limit} | Qty: {order.qty:8.2f}")
+            print("-" * 70)
         print()
 
+    def level_qty(self, side: str, price: float):
+        """
+        Calcula as quantidades agregadas de um nível de preço.
+        
+        Args:
+            side (str): Lado do book ('buy' ou 'sell')
+            price (float): Preço do nível
+            
+        Returns:
+            tuple: (quantidade exibida, quantidade oculta) do nível, (0, 0) se o nível não existir
+        """
+        book_side = self.bids if side == 'buy' else self.asks
+        displayed_qty = 0
+        hidden_qty = 0
+
+        for order in book_side.get(price, []):
+            displayed_qty += order.qty
+            hidden_qty += order.hidden_qty
+
+        return displayed_qty, hidden_qty
+
+    def replenish_iceberg(self, order: Order):
+        """
+        Repõe a fatia exibida de uma iceberg order a partir da reserva oculta.
+        
+        Args:
+            order (Order): Ordem passiva cuja quantidade exibida foi totalmente executada
+            
+        Returns:
+            bool: True se a ordem foi reposta e deve voltar ao fim da fila do nível,
+                  False se não há reserva (a ordem deve sair do book)
+                  
+        A reposição é feita na própria ordem, sem cancelamento e reinserção,
+        mantendo o mesmo ID e registro em orders_by_id.
+        """
+        if order.hidden_qty <= 0:
+            return False
+
+        order.qty = min(order.display_qty, order.hidden_qty)
+        order.hidden_qty -= order.qty
+        print(f'Iceberg order {order.id_order} replenished with qty {order.qty} (hidden qty {order.hidden_qty})')
+
+        return True
+
     def cancel_order(self, id_order: int):
         """
         Cancela uma ordem existente no order book.
@@ -379,12 +552,19 @@ class OrderBook:
         Returns:
             Order: A ordem cancelada, ou None se não encontrada
             
-        Remove a ordem do book e do índice de ordens por ID.
+        Remove a ordem do book (ou do índice de disparo, para stop orders)
+        e do índice de ordens por ID.
         """
         if id_order in self.orders_by_id:
             order_found = self.orders_by_id[id_order]
             
-            if order_found.side == 'buy':
+            if order_found.type in ['stop', 'stop_limit']:
+                stops = self.buy_stops if order_found.side == 'buy' else self.sell_stops
+                stops[order_found.stop_price].remove(order_found)
+
+                if not stops[order_found.stop_price]:
+                    stops.pop(order_found.stop_price)
+            elif order_found.side == 'buy':
                 for order in self.bids[order_found.price]:
                     if order.id_order == id_order:
                         self.bids[order_found.price].remove(order)
@@ -421,6 +601,8 @@ class OrderBook:
             
         A edição mantém o ID da ordem mas pode resultar em novo posicionamento
         no order book e possível matching se o novo preço cruzar o spread.
+        Para stop orders, new_price é o novo preço de disparo (o preço limite
+        de uma stop_limit order é mantido).
         """
         order_to_edit = self.cancel_order(id_order)
         
@@ -441,6 +623,25 @@ class OrderBook:
                 self.insert_order([order_to_edit.type, order_to_edit.side, str(order_to_edit.qty), id_order])
 
                 print(f"Pegged Order ID {id_order} edited to Qty: {new_qty}.")
+            elif order_to_edit.type == 'iceberg':
+                if new_price is None:
+                    print(f"New price must be provided for iceberg orders.")
+                    return
+
+                self.insert_order([order_to_edit.type, order_to_edit.side, str(new_price), str(new_qty), str(order_to_edit.display_qty), id_order])
+
+                print(f"Iceberg Order ID {id_order} edited to Price: {new_price}, Qty: {new_qty}.")
+            elif order_to_edit.type in ['stop', 'stop_limit']:
+                if new_price is None:
+                    print(f"New stop price must be provided for stop orders.")
+                    return
+
+                if order_to_edit.type == 'stop':
+                    self.insert_order([order_to_edit.type, order_to_edit.side, str(new_price), str(new_qty), id_order])
+                else:
+                    self.insert_order([order_to_edit.type, order_to_edit.side, str(new_price), str(order_to_edit.price), str(new_qty), id_order])
+
+                print(f"Stop Order ID {id_order} edited to Stop Price: {new_price}, Qty: {new_qty}.")
         
         else:
             print(f"Order ID {id_order} could not be edited because it was not found.")
@@ -469,3 +670,59 @@ class OrderBook:
                     if order.type == 'peg':
                         self.edit_order(order.id_order, best_price, order.qty)
 
+    def collect_triggered_stops(self):
+        """
+        Remove dos índices de disparo as stop orders alcançadas pelo último preço.
+        
+        Returns:
+            list: Stop orders disparadas, na ordem em que devem ser liberadas
+            
+        Apenas o nível mais próximo de cada índice é comparado com last_price;
+        a busca para no primeiro nível que não dispara, sem percorrer as demais
+        stop orders pendentes. A ordem de liberação é determinística: compras por
+        preço de disparo crescente, depois vendas por preço de disparo decrescente,
+        respeitando a ordem de chegada dentro de cada nível.
+        """
+        triggered = []
+
+        if self.last_price is None:
+            return triggered
+
+        while self.buy_stops and self.buy_stops.peekitem(0)[0] <= self.last_price:
+            triggered.extend(self.buy_stops.popitem(0)[1])
+
+        while self.sell_stops and self.sell_stops.peekitem(0)[0] >= self.last_price:
+            triggered.extend(self.sell_stops.popitem(0)[1])
+
+        return triggered
+
+    def release_stops(self):
+        """
+        Libera em lote as stop orders disparadas pelo último preço negociado.
+        
+        Stop orders viram market orders e stop_limit orders viram limit orders,
+        mantendo o mesmo ID. Os trades gerados por elas podem disparar novas
+        stop orders (cascata), que são liberadas em lotes seguintes deste mesmo
+        loop em vez de chamadas recursivas.
+        """
+        if self.releasing_stops:
+            return
+
+        self.releasing_stops = True
+        try:
+            trigger_price = self.last_price
+            triggered = self.collect_triggered_stops()
+            while triggered:
+                for order in triggered:
+                    del self.orders_by_id[order.id_order]
+                    print(f'Stop order {order.id_order} triggered at last price {trigger_price}')
+
+                    if order.type == 'stop':
+                        self.insert_order(['market', order.side, str(order.qty), order.id_order])
+                    else:
+                        self.insert_order(['limit', order.side, str(order.price), str(order.qty), order.id_order])
+
+                trigger_price = self.last_price
+                triggered = self.collect_triggered_stops()
+        finally:
+            self.releasing_stops = False
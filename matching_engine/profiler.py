@@ -0,0 +1,231 @@
+import sys
+import time
+import tracemalloc
+
+STAGES = ['parse_command', 'insert_order', 'match_order', 'uptade_pegged', 'output']
+
+
+class ProfiledStream:
+    """
+    Encapsula um stream de saída atribuindo cada escrita ao estágio 'output'.
+
+    Attributes:
+        profiler (StageProfiler): Profiler que recebe as medições
+        stream: Stream de saída real (sys.stdout, devnull, ...)
+    """
+
+    def __init__(self, profiler, stream):
+        """
+        Inicializa o stream instrumentado.
+
+        Args:
+            profiler (StageProfiler): Profiler que recebe as medições
+            stream: Stream de saída real
+        """
+        self.profiler = profiler
+        self.stream = stream
+
+    def write(self, text):
+        self.profiler.enter('output')
+        try:
+            return self.stream.write(text)
+        finally:
+            self.profiler.exit()
+
+    def flush(self):
+        self.stream.flush()
+
+
+class StageProfiler:
+    """
+    Modo de diagnóstico que mede tempo e alocações por estágio do engine.
+
+    Os métodos parse_command, insert_order, match_order e uptade_pegged de um
+    OrderBook são instrumentados, assim como o caminho de saída (as escritas
+    de print). Para cada chamada são registrados o tempo (total e exclusivo,
+    sem os estágios internos) e, via tracemalloc, o pico de memória acima do
+    início da chamada (bytes alocados, incluindo temporários já liberados), a
+    memória retida ao final e a variação de blocos alocados. O custo de
+    memória da própria instrumentação é medido em start() e descontado.
+
+    Attributes:
+        stats (dict): Estatísticas acumuladas por estágio
+        stack (list): Chamadas de estágio em andamento (a última é a mais interna)
+        overhead (dict): Custo de memória por chamada da instrumentação
+    """
+
+    def __init__(self):
+        """
+        Inicializa o profiler com estatísticas zeradas para todos os estágios.
+        """
+        self.stats = {
+            stage: {'calls': 0, 'time': 0.0, 'self_time': 0.0, 'peak_bytes': 0, 'net_bytes': 0, 'net_blocks': 0}
+            for stage in STAGES
+        }
+        self.stack = []
+        self.overhead = {'peak_bytes': 0, 'net_bytes': 0, 'net_blocks': 0}
+
+    def attach(self, order_book):
+        """
+        Instrumenta os estágios de um order book.
+
+        Args:
+            order_book (OrderBook): Order book a ser instrumentado
+
+        Os métodos instrumentados são definidos na própria instância, então as
+        chamadas internas do engine (por exemplo, insert_order chamando
+        match_order) também passam pelo profiler.
+        """
+        for stage in STAGES:
+            if stage != 'output':
+                setattr(order_book, stage, self.wrap(stage, getattr(order_book, stage)))
+
+    def wrap(self, stage: str, method):
+        """
+        Cria uma versão instrumentada de um método.
+
+        Args:
+            stage (str): Nome do estágio
+            method: Método original
+
+        Returns:
+            function: Método que registra tempo e alocações a cada chamada
+        """
+        def profiled(*args, **kwargs):
+            self.enter(stage)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.exit()
+
+        return profiled
+
+    def wrap_output(self, stream):
+        """
+        Instrumenta um stream de saída.
+
+        Args:
+            stream: Stream para onde a saída do engine é escrita
+
+        Returns:
+            ProfiledStream: Stream que atribui as escritas ao estágio 'output'
+        """
+        return ProfiledStream(self, stream)
+
+    def start(self):
+        """
+        Inicia o rastreamento de alocações com tracemalloc e calibra o custo
+        de memória da instrumentação.
+        """
+        tracemalloc.start()
+        self.calibrate()
+
+    def calibrate(self, runs: int = 1000):
+        """
+        Mede o custo de memória de uma chamada de estágio vazia.
+
+        Args:
+            runs (int): Quantidade de chamadas vazias usadas na média
+        """
+        self.overhead = {'peak_bytes': 0, 'net_bytes': 0, 'net_blocks': 0}
+        self.stats['calibration'] = {'calls': 0, 'time': 0.0, 'self_time': 0.0, 'peak_bytes': 0, 'net_bytes': 0, 'net_blocks': 0}
+
+        for _ in range(runs):
+            self.enter('calibration')
+            self.exit()
+
+        stats = self.stats.pop('calibration')
+        self.overhead = {key: stats[key] / runs for key in self.overhead}
+
+    def stop(self):
+        """
+        Encerra o rastreamento de alocações.
+        """
+        tracemalloc.stop()
+
+    def enter(self, stage: str):
+        """
+        Registra o início de uma chamada de estágio.
+
+        Args:
+            stage (str): Nome do estágio
+        """
+        frame = {'stage': stage, 'start': None, 'start_memory': None, 'peak': None, 'start_blocks': None, 'child_time': 0.0}
+        self.stack.append(frame)
+
+        current, peak = tracemalloc.get_traced_memory()
+        if len(self.stack) > 1:
+            self.stack[-2]['peak'] = max(self.stack[-2]['peak'], peak)
+        tracemalloc.reset_peak()
+
+        frame['start_memory'] = current
+        frame['peak'] = current
+        frame['start_blocks'] = sys.getallocatedblocks()
+        frame['start'] = time.perf_counter()
+
+    def exit(self):
+        """
+        Registra o fim da chamada de estágio mais interna.
+
+        O pico de memória de um estágio interno também conta para o pico dos
+        estágios que o chamaram, já que tracemalloc tem um único contador de pico.
+        """
+        end = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        tracemalloc.reset_peak()
+
+        frame = self.stack.pop()
+        peak = max(frame['peak'], peak)
+        elapsed = end - frame['start']
+
+        stats = self.stats[frame['stage']]
+        stats['calls'] += 1
+        stats['time'] += elapsed
+        stats['self_time'] += elapsed - frame['child_time']
+        stats['peak_bytes'] += peak - frame['start_memory'] - self.overhead['peak_bytes']
+        stats['net_bytes'] += current - frame['start_memory'] - self.overhead['net_bytes']
+        stats['net_blocks'] += blocks - frame['start_blocks'] - self.overhead['net_blocks']
+
+        if self.stack:
+            self.stack[-1]['child_time'] += elapsed
+            self.stack[-1]['peak'] = max(self.stack[-1]['peak'], peak)
+
+    def report(self):
+        """
+        Monta o relatório dos estágios ordenado por tempo exclusivo e por alocação.
+
+        Returns:
+            str: Relatório formatado, com o custo médio por comando no cabeçalho
+        """
+        commands = self.stats['parse_command']['calls']
+        total_time = sum(stats['self_time'] for stats in self.stats.values())
+        stages = [stage for stage in STAGES if self.stats[stage]['calls']]
+
+        lines = ["=" * 100, " " * 35 + "STAGE PROFILE", "=" * 100]
+        if commands:
+            command_stats = self.stats['parse_command']
+            lines.append(f"Commands: {commands} | Time/command: {command_stats['time'] / commands * 1e6:.2f} us | "
+                         f"Peak bytes/command: {command_stats['peak_bytes'] / commands:.1f} | "
+                         f"Net blocks/command: {command_stats['net_blocks'] / commands:.2f}")
+
+        header = (f"  {'Stage':<15}{'Calls':>10}{'Self time (s)':>15}{'Self %':>9}"
+                  f"{'us/call':>10}{'Peak B/call':>13}{'Net bytes':>12}{'Net blocks':>12}")
+
+        for title, key in (("Ranked by self time", lambda stage: self.stats[stage]['self_time']),
+                           ("Ranked by peak bytes per call", lambda stage: self.stats[stage]['peak_bytes'] / self.stats[stage]['calls'])):
+            lines.append("")
+            lines.append(title + ":")
+            lines.append("-" * 100)
+            lines.append(header)
+
+            for stage in sorted(stages, key=key, reverse=True):
+                stats = self.stats[stage]
+                share = stats['self_time'] / total_time * 100 if total_time else 0.0
+                lines.append(f"  {stage:<15}{stats['calls']:>10}{stats['self_time']:>15.4f}{share:>8.1f}%"
+                             f"{stats['self_time'] / stats['calls'] * 1e6:>10.2f}"
+                             f"{stats['peak_bytes'] / stats['calls']:>13.1f}"
+                             f"{stats['net_bytes']:>12.0f}{stats['net_blocks']:>12.0f}")
+
+        lines.append("-" * 100)
+        return "\n".join(lines)
@@ -0,0 +1,64 @@
+import json
+
+from matching_engine.order import Order
+from matching_engine.order_book import OrderBook
+
+
+def save_snapshot(order_book: OrderBook, path: str):
+    """
+    Salva o estado de um order book em um arquivo JSON.
+
+    Args:
+        order_book (OrderBook): Order book a ser salvo
+        path (str): Caminho do arquivo de snapshot
+
+    A ordem das filas de cada nível de preço (incluindo os índices de stop
+    orders) é preservada, mantendo a prioridade de chegada das ordens ao
+    restaurar o snapshot.
+    """
+    snapshot = {
+        'next_id': order_book.next_id,
+        'bids': [[price, [vars(order) for order in level]] for price, level in order_book.bids.items()],
+        'asks': [[price, [vars(order) for order in level]] for price, level in order_book.asks.items()],
+        'buy_stops': [[price, [vars(order) for order in level]] for price, level in order_book.buy_stops.items()],
+        'sell_stops': [[price, [vars(order) for order in level]] for price, level in order_book.sell_stops.items()],
+        'last_price': order_book.last_price,
+    }
+
+    with open(path, 'w') as snapshot_file:
+        json.dump(snapshot, snapshot_file)
+
+
+def load_snapshot(path: str):
+    """
+    Restaura um order book a partir de um arquivo JSON salvo por save_snapshot.
+
+    Args:
+        path (str): Caminho do arquivo de snapshot
+
+    Returns:
+        OrderBook: Order book com as ordens, filas, stop orders, último preço
+                   e próximo ID restaurados
+
+    Raises:
+        ValueError: Se o arquivo não for um snapshot válido
+    """
+    with open(path) as snapshot_file:
+        try:
+            snapshot = json.load(snapshot_file)
+        except json.JSONDecodeError as e:
+            raise ValueError(f'Invalid snapshot file "{path}": {e}')
+
+    order_book = OrderBook()
+    order_book.next_id = snapshot['next_id']
+    order_book.last_price = snapshot.get('last_price')
+
+    for book_side, levels in ((order_book.bids, snapshot['bids']), (order_book.asks, snapshot['asks']),
+                              (order_book.buy_stops, snapshot.get('buy_stops', [])),
+                              (order_book.sell_stops, snapshot.get('sell_stops', []))):
+        for price, level in levels:
+            book_side[price] = [Order(**order_attr) for order_attr in level]
+            for order in book_side[price]:
+                order_book.orders_by_id[order.id_order] = order
+
+    return order_book
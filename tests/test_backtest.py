@@ -0,0 +1,41 @@
+import csv
+from matching_engine.backtest import run_file, run_backtest
+
+
+class TestBacktest:
+    """Testes simples para o backtest paralelo"""
+    
+    def test_run_file_is_headless(self, tmp_path, capsys):
+        """Testa que o replay de um arquivo não gera saída e coleta o trade tape"""
+        path = tmp_path / 'flow.txt'
+        path.write_text('# comentário\nlimit sell 100.0 10.0\n\nlimit buy 100.0 4.0\ninvalid\n')
+        
+        result = run_file(str(path))
+        
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert result['commands'] == 3
+        assert result['errors'] == 1
+        assert result['trades'] == [(1, 'buy', 100.0, 4.0)]
+        assert result['best_ask'] == 100.0
+        assert result['ask_qty'] == 6.0
+    
+    def test_run_backtest_merges_results(self, tmp_path):
+        """Testa que os resultados de vários arquivos são consolidados na ordem de entrada"""
+        paths = []
+        for i in range(3):
+            path = tmp_path / f'flow_{i}.txt'
+            path.write_text(f'limit sell 100.0 {i + 1}.0\nmarket buy 10.0\n')
+            paths.append(str(path))
+        output_dir = tmp_path / 'out'
+        
+        totals = run_backtest(paths, str(output_dir), workers=2, chunksize=1)
+        
+        assert totals['files'] == 3
+        assert totals['trades'] == 3
+        with open(output_dir / 'trades.csv') as trades_file:
+            rows = list(csv.DictReader(trades_file))
+        assert [row['file'] for row in rows] == paths
+        assert [row['qty'] for row in rows] == ['1.0', '2.0', '3.0']
+        with open(output_dir / 'stats.csv') as stats_file:
+            assert len(list(csv.DictReader(stats_file))) == 3
@@ -48,3 +48,27 @@ class TestOrder:
         order.price = 105.0
         
         assert order.price == 105.0
+    
+    def test_create_iceberg_order(self):
+        """Testa a criação de uma ordem iceberg"""
+        order = Order(id_order=6, type='iceberg', side='buy', price=100.0, qty=10.0, display_qty=10.0, hidden_qty=90.0)
+        
+        assert order.type == 'iceberg'
+        assert order.qty == 10.0
+        assert order.display_qty == 10.0
+        assert order.hidden_qty == 90.0
+    
+    def test_default_hidden_qty(self):
+        """Testa que ordens comuns não possuem reserva oculta"""
+        order = Order(id_order=7, type='limit', side='buy', price=100.0, qty=10.0)
+        
+        assert order.display_qty is None
+        assert order.hidden_qty == 0
+    
+    def test_create_stop_limit_order(self):
+        """Testa a criação de uma ordem stop limit"""
+        order = Order(id_order=8, type='stop_limit', side='sell', price=95.0, qty=10.0, stop_price=96.0)
+        
+        assert order.type == 'stop_limit'
+        assert order.price == 95.0
+        assert order.stop_price == 96.0
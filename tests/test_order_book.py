@@ -147,3 +147,137 @@ class TestOrderBook:
         assert 'ORDER BOOK' in captured.out
         assert 'Order ID:   0' in captured.out
         assert 'Order ID:   1' in captured.out
+    
+    def test_add_iceberg_order(self, capsys):
+        """Testa adicionar uma ordem iceberg exibindo apenas uma fatia"""
+        book = OrderBook()
+        book.parse_command('iceberg sell 100.0 50.0 10.0')
+        
+        captured = capsys.readouterr()
+        assert 'Iceberg sell order 0 placed at price 100.0 for qty 10.0 (hidden qty 40.0)' in captured.out
+        assert book.level_qty('sell', 100.0) == (10.0, 40.0)
+    
+    def test_iceberg_replenish_goes_to_back_of_queue(self, capsys):
+        """Testa que a reposição da iceberg volta ao fim da fila do nível"""
+        book = OrderBook()
+        book.parse_command('iceberg sell 100.0 30.0 10.0')
+        book.parse_command('limit sell 100.0 5.0')
+        book.parse_command('limit buy 100.0 10.0')
+        
+        captured = capsys.readouterr()
+        assert 'Iceberg order 0 replenished with qty 10.0 (hidden qty 10.0)' in captured.out
+        assert [order.id_order for order in book.asks[100.0]] == [1, 0]
+        assert 0 in book.orders_by_id
+        assert book.level_qty('sell', 100.0) == (15.0, 10.0)
+    
+    def test_iceberg_fully_consumed_by_market(self, capsys):
+        """Testa consumo completo de uma iceberg por uma market order"""
+        book = OrderBook()
+        book.parse_command('iceberg buy 100.0 25.0 10.0')
+        book.parse_command('market sell 25.0')
+        
+        captured = capsys.readouterr()
+        assert 'Trade, price: 100.0, qty: 25.0' in captured.out
+        assert 'Market order 1 executed successfully' in captured.out
+        assert len(book.bids) == 0
+        assert len(book.orders_by_id) == 0
+    
+    def test_aggressive_iceberg_matches_total_qty(self, capsys):
+        """Testa que uma iceberg agressora executa com a quantidade total"""
+        book = OrderBook()
+        book.parse_command('limit sell 100.0 15.0')
+        book.parse_command('iceberg buy 100.0 40.0 10.0')
+        
+        captured = capsys.readouterr()
+        assert 'Trade, price: 100.0, qty: 15.0' in captured.out
+        assert 'Iceberg buy order 1 placed at price 100.0 for qty 10.0 (hidden qty 15.0)' in captured.out
+    
+    def test_limit_sell_partial_fill_reduces_passive_qty(self, capsys):
+        """Testa que uma limit sell parcial reduz a quantidade da ordem passiva"""
+        book = OrderBook()
+        book.parse_command('limit buy 100.0 10.0')
+        book.parse_command('limit sell 100.0 4.0')
+        
+        assert book.bids[100.0][0].qty == 6.0
+    
+    def test_print_order_book_hidden_qty(self, capsys):
+        """Testa que o total do nível separa quantidade exibida e oculta"""
+        book = OrderBook()
+        book.parse_command('iceberg buy 100.0 50.0 10.0')
+        book.parse_command('print')
+        
+        captured = capsys.readouterr()
+        assert 'Total Qty:    10.00 | Hidden Qty:    40.00' in captured.out
+    
+    def test_trade_tape(self, capsys):
+        """Testa o registro opcional de trades"""
+        book = OrderBook()
+        book.trade_tape = []
+        book.parse_command('limit sell 100.0 10.0')
+        book.parse_command('market buy 4.0')
+        
+        assert book.trade_tape == [(1, 'buy', 100.0, 4.0)]
+    
+    def test_stop_order_held_outside_book(self, capsys):
+        """Testa que stop orders ficam fora do book visível"""
+        book = OrderBook()
+        book.parse_command('stop buy 101.0 5.0')
+        
+        captured = capsys.readouterr()
+        assert 'Stop buy order 0 placed with stop price 101.0 for qty 5.0' in captured.out
+        assert len(book.bids) == 0
+        assert list(book.buy_stops) == [101.0]
+        assert 0 in book.orders_by_id
+    
+    def test_stop_order_triggered_by_trade(self, capsys):
+        """Testa que uma stop order vira market order quando o último preço a alcança"""
+        book = OrderBook()
+        book.parse_command('limit sell 100.0 10.0')
+        book.parse_command('stop buy 100.0 5.0')
+        book.parse_command('limit buy 100.0 2.0')
+        
+        captured = capsys.readouterr()
+        assert 'Stop order 1 triggered at last price 100.0' in captured.out
+        assert 'Market order 1 executed successfully' in captured.out
+        assert book.asks[100.0][0].qty == 3.0
+        assert len(book.buy_stops) == 0
+    
+    def test_stop_limit_order_triggered(self, capsys):
+        """Testa que uma stop limit order vira limit order quando disparada"""
+        book = OrderBook()
+        book.parse_command('limit buy 100.0 10.0')
+        book.parse_command('stop_limit sell 100.0 99.0 5.0')
+        book.parse_command('market sell 1.0')
+        
+        captured = capsys.readouterr()
+        assert 'Stop order 1 triggered at last price 100.0' in captured.out
+        assert 'Limit sell order 1 placed at price 99.0 for qty 5.0' in captured.out
+        assert len(book.sell_stops) == 0
+    
+    def test_stop_orders_cascade_in_order(self, capsys):
+        """Testa o disparo em cascata de stop orders em ordem determinística"""
+        book = OrderBook()
+        book.parse_command('limit sell 100.0 5.0')
+        book.parse_command('limit sell 101.0 5.0')
+        book.parse_command('limit sell 102.0 5.0')
+        book.parse_command('stop buy 101.0 5.0')
+        book.parse_command('stop buy 100.0 5.0')
+        book.parse_command('stop buy 105.0 5.0')
+        book.parse_command('limit buy 100.0 1.0')
+        
+        captured = capsys.readouterr()
+        assert captured.out.index('Stop order 4 triggered at last price 100.0') < captured.out.index('Stop order 3 triggered at last price 101.0')
+        assert 'Stop order 5 triggered' not in captured.out
+        assert list(book.buy_stops) == [105.0]
+        assert book.last_price == 102.0
+    
+    def test_cancel_stop_order(self, capsys):
+        """Testa cancelar uma stop order pendente"""
+        book = OrderBook()
+        book.parse_command('stop sell 95.0 5.0')
+        book.parse_command('cancel 0')
+        
+        captured = capsys.readouterr()
+        assert 'Order ID 0 cancelled.' in captured.out
+        assert len(book.sell_stops) == 0
+        assert len(book.orders_by_id) == 0
@@ -0,0 +1,56 @@
+import contextlib
+import io
+import tracemalloc
+from matching_engine.order_book import OrderBook
+from matching_engine.profiler import StageProfiler
+
+
+class TestStageProfiler:
+    """Testes simples para o modo de diagnóstico por estágio"""
+    
+    def run_profiled(self, commands):
+        """Executa comandos em um order book instrumentado"""
+        book = OrderBook()
+        profiler = StageProfiler()
+        profiler.attach(book)
+        output = io.StringIO()
+        
+        profiler.start()
+        try:
+            with contextlib.redirect_stdout(profiler.wrap_output(output)):
+                for command in commands:
+                    book.parse_command(command)
+        finally:
+            profiler.stop()
+        
+        return profiler, output.getvalue()
+    
+    def test_stages_are_counted(self):
+        """Testa a contagem de chamadas por estágio, incluindo chamadas internas"""
+        profiler, output = self.run_profiled(['limit buy 100.0 10.0', 'peg buy 5.0', 'limit buy 101.0 5.0', 'market sell 2.0'])
+        
+        assert profiler.stats['parse_command']['calls'] == 4
+        assert profiler.stats['match_order']['calls'] == 3
+        assert profiler.stats['uptade_pegged']['calls'] == 2
+        assert profiler.stats['output']['calls'] > 0
+        assert 'Trade, price: 101.0, qty: 2.0' in output
+        assert not tracemalloc.is_tracing()
+    
+    def test_self_time_excludes_inner_stages(self):
+        """Testa que o tempo exclusivo de um estágio não inclui os estágios internos"""
+        profiler, _ = self.run_profiled(['limit sell 100.0 10.0', 'limit buy 100.0 10.0'])
+        
+        parse_stats = profiler.stats['parse_command']
+        assert parse_stats['self_time'] < parse_stats['time']
+        assert parse_stats['peak_bytes'] > 0
+    
+    def test_report_ranks_stages(self):
+        """Testa que o relatório lista os estágios executados"""
+        profiler, _ = self.run_profiled(['limit sell 100.0 10.0', 'market buy 5.0'])
+        
+        report = profiler.report()
+        assert 'STAGE PROFILE' in report
+        assert 'Commands: 2' in report
+        assert 'Ranked by self time' in report
+        assert 'Ranked by peak bytes per call' in report
+        assert 'match_order' in report
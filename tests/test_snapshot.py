@@ -0,0 +1,45 @@
+import pytest
+from matching_engine.order_book import OrderBook
+from matching_engine.snapshot import save_snapshot, load_snapshot
+
+
+class TestSnapshot:
+    """Testes simples para o snapshot do order book"""
+    
+    def test_round_trip_preserves_book(self, tmp_path, capsys):
+        """Testa que salvar e restaurar preserva ordens, filas e próximo ID"""
+        book = OrderBook()
+        book.parse_command('limit buy 100.0 10.0')
+        book.parse_command('limit buy 100.0 5.0')
+        book.parse_command('iceberg sell 105.0 50.0 10.0')
+        path = tmp_path / 'snapshot.json'
+        
+        save_snapshot(book, str(path))
+        restored = load_snapshot(str(path))
+        
+        assert restored.next_id == 3
+        assert [order.id_order for order in restored.bids[100.0]] == [0, 1]
+        assert restored.level_qty('sell', 105.0) == (10.0, 40.0)
+        assert set(restored.orders_by_id) == {0, 1, 2}
+    
+    def test_restored_book_keeps_matching(self, tmp_path, capsys):
+        """Testa que o order book restaurado continua executando trades"""
+        book = OrderBook()
+        book.parse_command('limit sell 100.0 10.0')
+        path = tmp_path / 'snapshot.json'
+        save_snapshot(book, str(path))
+        
+        restored = load_snapshot(str(path))
+        restored.parse_command('limit buy 100.0 10.0')
+        
+        captured = capsys.readouterr()
+        assert 'Trade, price: 100.0, qty: 10.0' in captured.out
+        assert 'Limit order 1 fully executed' in captured.out
+    
+    def test_invalid_snapshot(self, tmp_path):
+        """Testa carregar um arquivo que não é um snapshot válido"""
+        path = tmp_path / 'snapshot.json'
+        path.write_text('not json')
+        
+        with pytest.raises(ValueError, match='Invalid snapshot file'):
+            load_snapshot(str(path))